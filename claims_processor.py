@@ -5,10 +5,210 @@ Extracts FNOL data, validates fields, and routes claims intelligently
 """
 
 import re
+import sys
 import json
+import hashlib
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-import pdfplumber
+
+# Prefer pdfium's native text extraction; pdfplumber is the pure-Python fallback
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+    import pdfplumber
+
+# Aho-Corasick keyword matching when available, regex alternation otherwise
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# orjson serializes results in native code; stdlib json is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# RE2 guarantees linear-time matching on malformed or adversarial text; stdlib
+# re is the fallback
+try:
+    import re2 as re_engine
+except ImportError:
+    re_engine = re
+
+
+# Field extraction patterns. Each one accepts both the ACORD PDF layout and
+# the plain-text FNOL layout, and each has exactly one capture group. Labels
+# are matched case-sensitively as printed on the form; value classes spell out
+# both cases where the value may be mixed case.
+_FIELD_SOURCES = {
+    'policy_number': r'POLICY NUMBER[:\s]*([A-Za-z0-9-]+)',
+    'policyholder_name': (
+        r'NAME OF INSURED[:\s]*\(First, Middle, Last\)[:\s]*([A-Za-z\s,\.]+?)(?:\n|INSURED|DATE OF BIRTH)'
+    ),
+    'effective_date': r'EFFECTIVE DATE[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
+    'date_of_loss': r'DATE OF LOSS AND TIME[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
+    'street': r'STREET:[:\s]*([^\n]+)',
+    'city_state_zip': r'CITY, STATE, ZIP:[:\s]*([^\n]+)',
+    'claimant': (
+        r'NAME OF INSURED[:\s]*\(First, Middle, Last\)[:\s]*([A-Za-z\s,\.]+?)(?:\n|INSURED)'
+    ),
+    'driver_name': (
+        r"DRIVER'S NAME AND ADDRESS[:\s]*\(Check if same as insured\)[:\s]*PHONE[^\n]*\n([A-Za-z\s,\.]+?)(?:\n|PHONE)"
+    ),
+    'email': r'E-MAIL ADDRESS[:\s]*PRIMARY(?: E-MAIL ADDRESS)?[:\s]*([^\s\n]+@[^\s\n]+)',
+    # ACORD puts the year after the vehicle number; the FNOL has it on its own
+    # line. Only the number may sit in between, so the match never spans a label.
+    'vehicle_year': r'(?:VEH #[\s\d:#]*|(?m:^))YEAR[:\s]*(\d{4})',
+    'vehicle_make': r'MAKE:[:\s]*([A-Za-z]{2,})',
+    'vehicle_model': r'MODEL:[:\s]*([A-Za-z0-9\s]+?)(?:\n|BODY)',
+    'vin': r'V\.I\.N\.:[:\s]*([A-Za-z0-9]{17})',
+    'estimate': r'ESTIMATE AMOUNT:[:\s]*\$?([0-9,]+(?:\.\d{2})?)',
+    'line_of_business': r'LINE OF BUSINESS[:\s]*([A-Za-z\s]+?)(?:\n|ACORD|INSURED)',
+    'naic_code': r'CARRIER NAIC CODE[:\s]*(\d+)',
+}
+
+# Flags are inline so the same sources compile under either engine. RE2's \s
+# and \d are ASCII-only already; stdlib re is told the same.
+_FIELD_FLAGS = '(?a)' if re_engine is re else ''
+
+# Stdlib re supports possessive quantifiers from Python 3.11
+_POSSESSIVE_SEPARATORS = re_engine is re and sys.version_info >= (3, 11)
+
+
+def _compile_field(source: str):
+    """Compile a field pattern with ASCII character classes"""
+    if _POSSESSIVE_SEPARATORS:
+        # A label separator never has to give characters back to the value
+        # after it; making it possessive stops the engine from retrying every
+        # split of a long whitespace run when a match fails
+        source = source.replace(r'[:\s]*', r'[:\s]*+')
+    return re_engine.compile(_FIELD_FLAGS + source)
+
+
+_PATTERNS = {key: _compile_field(source) for key, source in _FIELD_SOURCES.items()}
+
+# RE2 has no lookahead, so the multi-line accident description is read in two
+# steps: this pattern finds where it starts, then lines are taken until a blank
+# line or the next section heading. The description label is still matched
+# case-insensitively. A heading is an uppercase label at the start of a line,
+# ending there or followed by a space, ':' or '(' (the ACORD layout puts more
+# text after it). Headings are case-sensitive, so sentences such as "Vehicle
+# behind did not stop." are kept.
+_DESCRIPTION_ANCHOR = _compile_field(r'(?i:DESCRIPTION OF ACCIDENT)[:\s]*(?:\(ACORD[^\)]*\)[:\s]*)?')
+_DESCRIPTION_STOP_HEADINGS = (
+    'LOSS',
+    'LOCATION OF LOSS',
+    'VEHICLE',
+    'INSURED VEHICLE',
+    'DRIVER',
+    "DRIVER'S",
+    'OWNER',
+    "OWNER'S",
+    'WITNESSES',
+)
+_DESCRIPTION_STOP = _compile_field(
+    '(?:' + '|'.join(map(re.escape, _DESCRIPTION_STOP_HEADINGS)) + r')(?:[ :(]|$)'
+)
+
+# Fields with their own capture shape or case rules
+_TIME_RE = _compile_field(r'(\d{1,2}:\d{2})\s*((?i:AM|PM))')
+_PHONE_RE = _compile_field(r'PHONE #[:\s]*(?:HOME BUS CELL )?PRIMARY[:\s]*(\d{3}[-\.\s]?\d{3}[-\.\s]?\d{4})')
+
+
+def to_json_bytes(obj: Any, compact: bool = False) -> bytes:
+    """
+    Serialize a result to UTF-8 encoded JSON
+    
+    Args:
+        obj: JSON-serializable object
+        compact: Omit indentation and whitespace (API mode)
+        
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj) if compact else orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+@lru_cache(maxsize=None)
+def _keyword_matcher(keywords: tuple):
+    """
+    Build a predicate that tells whether lowercase text contains any keyword
+    
+    All keywords are matched in a single pass over the text. Matchers are
+    cached, so each keyword set is only compiled once.
+    
+    Args:
+        keywords: Lowercase keywords to look for (plain substrings)
+        
+    Returns:
+        Function taking the text and returning True on the first hit
+    """
+    if not keywords:
+        return lambda text: False
+    
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    
+    pattern = re.compile('|'.join(map(re.escape, keywords)))
+    return lambda text: pattern.search(text) is not None
+
+
+FRAUD_KEYWORDS = ('fraud', 'inconsistent', 'staged', 'suspicious', 'fabricated')
+INJURY_KEYWORDS = ('injury', 'injured', 'hospital', 'medical', 'ambulance', 'bodily')
+
+_has_injury_keyword = _keyword_matcher(INJURY_KEYWORDS)
+_has_property_keyword = _keyword_matcher(('property', 'damage'))
+_has_collision_keyword = _keyword_matcher(('collision', 'accident'))
+
+# Supplementary fields whose value is a single token right after its label.
+# Their matches never span another label, so they can share one pass over the
+# document. Free-text fields (names, address lines, description) may run into
+# the next label and are still searched individually, as are the mandatory
+# fields, which are extracted before anything else.
+_SCAN_FIELDS = (
+    'effective_date',
+    'email',
+    'vehicle_year',
+    'vehicle_make',
+    'vin',
+    'estimate',
+    'naic_code',
+)
+_FIELD_SCAN = _compile_field(
+    '|'.join(f'(?P<{key}>{_FIELD_SOURCES[key]})' for key in _SCAN_FIELDS)
+)
+
+# Results of process_claim keyed by processor class and SHA-256 of the PDF
+# bytes, least recently used first. The class is part of the key because
+# subclasses may route the same document differently.
+_RESULT_CACHE: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+# Guards every lookup, reorder and eviction, so process_claim can be called
+# from several threads at once
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def _file_digest(path: str) -> str:
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 class ClaimsProcessor:
@@ -18,18 +218,46 @@ class ClaimsProcessor:
     """
     
     # Define mandatory fields for validation
-    MANDATORY_FIELDS = [
+    MANDATORY_FIELDS = (
         'policy_number',
         'policyholder_name',
         'date_of_loss',
         'location_of_loss',
         'description_of_accident',
         'claim_type'
-    ]
+    )
+    
+    # Fields produced by extraction, in output order
+    EXTRACTED_FIELDS = (
+        'policy_number',
+        'policyholder_name',
+        'effective_date',
+        'date_of_loss',
+        'time_of_loss',
+        'location_of_loss',
+        'description_of_accident',
+        'claimant',
+        'driver_name',
+        'contact_phone',
+        'contact_email',
+        'asset_type',
+        'asset_id',
+        'vehicle_description',
+        'estimated_damage',
+        'claim_type',
+        'line_of_business',
+        'naic_code'
+    )
     
     # Routing thresholds and keywords
     FAST_TRACK_THRESHOLD = 25000
-    FRAUD_KEYWORDS = ['fraud', 'inconsistent', 'staged', 'suspicious', 'fabricated']
+    FRAUD_KEYWORDS = list(FRAUD_KEYWORDS)
+    
+    # Number of processed claims kept in the result cache
+    RESULT_CACHE_SIZE = 1024
+    
+    # Per-claim state only; everything else is class-level configuration
+    __slots__ = ('extracted_data', 'missing_fields', 'route', 'reasoning')
     
     def __init__(self):
         self.extracted_data = {}
@@ -45,213 +273,313 @@ class ClaimsProcessor:
             pdf_path: Path to the PDF file
             
         Returns:
-            Dictionary containing extracted fields
-        """
-        extracted = {
-            'policy_information': {},
-            'incident_information': {},
-            'involved_parties': {},
-            'asset_details': {},
-            'other_fields': {}
-        }
-        
+            Flat dictionary of extracted fields (see ``EXTRACTED_FIELDS``)
+        """
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                full_text = ""
-                for page in pdf.pages:
-                    full_text += page.extract_text() + "\n"
-                
-                # Extract Policy Information
-                extracted['policy_information']['policy_number'] = self._extract_field(
-                    full_text, r'POLICY NUMBER[:\s]*([A-Z0-9-]+)'
-                )
-                extracted['policy_information']['policyholder_name'] = self._extract_field(
-                    full_text, r'NAME OF INSURED[:\s]*\(First, Middle, Last\)[:\s]*([A-Za-z\s,\.]+?)(?:\n|DATE OF BIRTH)'
-                )
-                
-                # Extract dates from policy section or date fields
-                effective_date = self._extract_field(full_text, r'EFFECTIVE DATE[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})')
-                if effective_date:
-                    extracted['policy_information']['effective_date'] = effective_date
-                
-                # Extract Incident Information
-                extracted['incident_information']['date_of_loss'] = self._extract_field(
-                    full_text, r'DATE OF LOSS AND TIME[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})'
-                )
-                
-                # Extract time (AM/PM)
-                time_match = re.search(r'(\d{1,2}:\d{2})\s*(AM|PM)', full_text, re.IGNORECASE)
-                if time_match:
-                    extracted['incident_information']['time'] = f"{time_match.group(1)} {time_match.group(2)}"
-                
-                # Extract location
-                street = self._extract_field(full_text, r'STREET:[:\s]*([^\n]+)')
-                city_state_zip = self._extract_field(full_text, r'CITY, STATE, ZIP:[:\s]*([^\n]+)')
-                
-                location_parts = []
-                if street and street.strip():
-                    location_parts.append(street.strip())
-                if city_state_zip and city_state_zip.strip():
-                    location_parts.append(city_state_zip.strip())
-                
-                extracted['incident_information']['location'] = ', '.join(location_parts) if location_parts else None
-                
-                # Extract description
-                desc = self._extract_field(
-                    full_text, 
-                    r'DESCRIPTION OF ACCIDENT[:\s]*\(ACORD[^\)]*\)[:\s]*([^\n]+(?:\n(?!LOSS|DRIVER|OWNER|VEHICLE)[^\n]+)*)'
-                )
-                extracted['incident_information']['description'] = desc
-                
-                # Extract Involved Parties
-                claimant = self._extract_field(
-                    full_text, r'NAME OF INSURED[:\s]*\(First, Middle, Last\)[:\s]*([A-Za-z\s,\.]+?)(?:\n|INSURED)'
-                )
-                extracted['involved_parties']['claimant'] = claimant
-                
-                # Extract driver information
-                driver_name = self._extract_field(
-                    full_text, r"DRIVER'S NAME AND ADDRESS[:\s]*\(Check if same as insured\)[:\s]*PHONE[^\n]*\n([A-Za-z\s,\.]+?)(?:\n|PHONE)"
-                )
-                extracted['involved_parties']['driver_name'] = driver_name
-                
-                # Extract phone numbers
-                phone_match = re.search(r'PHONE #[:\s]*HOME BUS CELL PRIMARY[:\s]*(\d{3}[-\.\s]?\d{3}[-\.\s]?\d{4})', full_text)
-                if phone_match:
-                    extracted['involved_parties']['contact_phone'] = phone_match.group(1)
-                
-                # Extract email
-                email = self._extract_field(full_text, r'E-MAIL ADDRESS:[:\s]*PRIMARY E-MAIL ADDRESS:[:\s]*([^\s\n]+@[^\s\n]+)')
-                extracted['involved_parties']['contact_email'] = email
-                
-                # Extract Asset Details
-                vehicle_year = self._extract_field(full_text, r'VEH #[:\s]*YEAR[:\s]*(\d{4})')
-                vehicle_make = self._extract_field(full_text, r'MAKE:[:\s]*([A-Z][A-Za-z]+)')
-                vehicle_model = self._extract_field(full_text, r'MODEL:[:\s]*([A-Za-z0-9\s]+?)(?:\n|BODY)')
-                vin = self._extract_field(full_text, r'V\.I\.N\.:[:\s]*([A-Z0-9]{17})')
-                
-                extracted['asset_details']['asset_type'] = 'vehicle'
-                if vehicle_year or vehicle_make or vehicle_model:
-                    vehicle_desc = ' '.join(filter(None, [vehicle_year, vehicle_make, vehicle_model]))
-                    extracted['asset_details']['vehicle_description'] = vehicle_desc
-                
-                extracted['asset_details']['asset_id'] = vin
-                
-                # Extract damage estimate
-                estimate = self._extract_field(full_text, r'ESTIMATE AMOUNT:[:\s]*\$?([0-9,]+(?:\.\d{2})?)')
-                if estimate:
-                    # Clean the estimate (remove commas)
-                    estimate_clean = estimate.replace(',', '')
-                    try:
-                        extracted['asset_details']['estimated_damage'] = float(estimate_clean)
-                    except ValueError:
-                        extracted['asset_details']['estimated_damage'] = None
-                
-                # Determine claim type
-                claim_type = self._determine_claim_type(full_text)
-                extracted['other_fields']['claim_type'] = claim_type
-                
-                # Extract Line of Business
-                lob = self._extract_field(full_text, r'LINE OF BUSINESS[:\s]*([A-Z\s]+?)(?:\n|ACORD)')
-                extracted['other_fields']['line_of_business'] = lob
-                
-                # Extract NAIC code
-                naic = self._extract_field(full_text, r'CARRIER NAIC CODE[:\s]*(\d+)')
-                extracted['other_fields']['naic_code'] = naic
-                
+            full_text = self._read_pdf_text(pdf_path)
+            return self._extract_fields_from_text(full_text)
         except Exception as e:
             print(f"Error extracting PDF: {str(e)}")
             
-        return extracted
+        return dict.fromkeys(self.EXTRACTED_FIELDS)
+    
+    def _extract_fields_from_text(self, text: str) -> Dict[str, Any]:
+        """
+        Extract all relevant information from FNOL document text
+        
+        Shared by PDF and plain-text inputs.
+        
+        Args:
+            text: Full document text
+            
+        Returns:
+            Flat dictionary of extracted fields (see ``EXTRACTED_FIELDS``)
+        """
+        flat = dict.fromkeys(self.EXTRACTED_FIELDS)
+        flat.update(self._extract_mandatory_fields(text))
+        flat.update(self._extract_supplementary_fields(text))
+        return flat
+    
+    def _extract_mandatory_fields(self, text: str) -> Dict[str, Any]:
+        """
+        Extract only the fields listed in ``MANDATORY_FIELDS``
+        
+        Args:
+            text: Full document text
+            
+        Returns:
+            Dictionary of mandatory field values
+        """
+        fields = {}
+        
+        # Extract Policy Information
+        fields['policy_number'] = self._extract_field(text, _PATTERNS['policy_number'])
+        fields['policyholder_name'] = self._extract_field(text, _PATTERNS['policyholder_name'])
+        
+        # Extract Incident Information
+        fields['date_of_loss'] = self._extract_field(text, _PATTERNS['date_of_loss'])
+        
+        # Extract location
+        street = self._extract_field(text, _PATTERNS['street'])
+        city_state_zip = self._extract_field(text, _PATTERNS['city_state_zip'])
+        
+        location_parts = []
+        if street and street.strip():
+            location_parts.append(street.strip())
+        if city_state_zip and city_state_zip.strip():
+            location_parts.append(city_state_zip.strip())
+        
+        fields['location_of_loss'] = ', '.join(location_parts) if location_parts else None
+        
+        # Extract description
+        fields['description_of_accident'] = self._extract_description(text)
+        
+        # Determine claim type
+        fields['claim_type'] = self._determine_claim_type(text.lower())
+        
+        return fields
+    
+    def _extract_supplementary_fields(self, text: str) -> Dict[str, Any]:
+        """
+        Extract the fields that are not needed to decide on Manual Review
+        
+        Args:
+            text: Full document text
+            
+        Returns:
+            Dictionary of supplementary field values
+        """
+        fields = {}
+        
+        # Single-token fields in one pass
+        scanned = self._scan_fields(text)
+        
+        fields['effective_date'] = scanned.get('effective_date')
+        
+        # Extract time (AM/PM)
+        time_match = _TIME_RE.search(text)
+        if time_match:
+            fields['time_of_loss'] = f"{time_match.group(1)} {time_match.group(2)}"
+        
+        # Extract Involved Parties
+        fields['claimant'] = self._extract_field(text, _PATTERNS['claimant'])
+        
+        # Extract driver information
+        fields['driver_name'] = self._extract_field(text, _PATTERNS['driver_name'])
+        
+        # Extract phone numbers
+        phone_match = _PHONE_RE.search(text)
+        if phone_match:
+            fields['contact_phone'] = phone_match.group(1)
+        
+        # Extract email
+        fields['contact_email'] = scanned.get('email')
+        
+        # Extract Asset Details
+        vehicle_year = scanned.get('vehicle_year')
+        vehicle_make = scanned.get('vehicle_make')
+        vehicle_model = self._extract_field(text, _PATTERNS['vehicle_model'])
+        
+        fields['asset_type'] = 'vehicle'
+        fields['asset_id'] = scanned.get('vin')
+        if vehicle_year or vehicle_make or vehicle_model:
+            fields['vehicle_description'] = ' '.join(filter(None, [vehicle_year, vehicle_make, vehicle_model]))
+        
+        # Extract damage estimate
+        estimate = scanned.get('estimate')
+        if estimate:
+            # Clean the estimate (remove commas)
+            estimate_clean = estimate.replace(',', '')
+            try:
+                fields['estimated_damage'] = float(estimate_clean)
+            except ValueError:
+                fields['estimated_damage'] = None
+        
+        # Extract Line of Business
+        fields['line_of_business'] = self._extract_field(text, _PATTERNS['line_of_business'])
+        
+        # Extract NAIC code
+        fields['naic_code'] = scanned.get('naic_code')
+        
+        return fields
+    
+    @staticmethod
+    def _read_pdf_text(pdf_path: str) -> str:
+        """
+        Read the text of every page of a PDF
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            Page texts, each followed by a newline
+        """
+        parts = []
+        
+        if pdfium is not None:
+            pdf = pdfium.PdfDocument(pdf_path)
+            try:
+                for page in pdf:
+                    # pdfium separates lines with CRLF; the patterns expect LF
+                    page_text = page.get_textpage().get_text_range()
+                    parts.append(page_text.replace('\r\n', '\n'))
+            finally:
+                pdf.close()
+        else:
+            with pdfplumber.open(pdf_path) as pdf:
+                for page in pdf.pages:
+                    parts.append(page.extract_text() or '')
+        
+        # Build the text in one allocation rather than growing it page by page
+        return "\n".join(parts) + "\n" if parts else ""
     
-    def _extract_field(self, text: str, pattern: str) -> Optional[str]:
+    @classmethod
+    def _extract_field(cls, text: str, pattern) -> Optional[str]:
         """
-        Extract a field using regex pattern
+        Extract a field using a compiled regex pattern
         
         Args:
             text: Full text to search
-            pattern: Regex pattern
+            pattern: Compiled regex pattern (see ``_PATTERNS``)
             
         Returns:
             Extracted value or None
         """
-        match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+        match = pattern.search(text)
         if match:
-            value = match.group(1).strip()
-            # Clean up the value
-            value = ' '.join(value.split())  # Normalize whitespace
-            return value if value else None
+            return cls._clean_value(match.group(1))
         return None
     
-    def _determine_claim_type(self, text: str) -> str:
+    @classmethod
+    def _extract_description(cls, text: str) -> Optional[str]:
+        """
+        Extract the multi-line accident description
+        
+        Args:
+            text: Full text to search
+            
+        Returns:
+            Description with whitespace normalized, or None
+        """
+        anchor = _DESCRIPTION_ANCHOR.search(text)
+        if not anchor:
+            return None
+        
+        lines = []
+        pos = anchor.end()
+        while pos < len(text):
+            end = text.find('\n', pos)
+            if end == -1:
+                end = len(text)
+            line = text[pos:end]
+            # Stop at a blank line or, after the first line, the next heading
+            if not line or (lines and _DESCRIPTION_STOP.match(line)):
+                break
+            lines.append(line)
+            pos = end + 1
+        
+        return cls._clean_value('\n'.join(lines))
+    
+    @staticmethod
+    def _clean_value(raw: str) -> Optional[str]:
+        """
+        Normalize whitespace in a captured field value
+        
+        Args:
+            raw: Raw captured text
+            
+        Returns:
+            Cleaned value or None if empty
+        """
+        value = ' '.join(raw.split())
+        return value if value else None
+    
+    @classmethod
+    def _scan_fields(cls, text: str) -> Dict[str, Optional[str]]:
+        """
+        Extract all single-token fields (``_SCAN_FIELDS``) in one pass
+        
+        Args:
+            text: Full text to search
+            
+        Returns:
+            Dictionary of field name to value for the fields that were found;
+            the first occurrence of each field wins
+        """
+        found = {}
+        for match in _FIELD_SCAN.finditer(text):
+            key = match.lastgroup
+            if key not in found:
+                # Each field pattern has one capture group, right after its named group
+                found[key] = cls._clean_value(match.group(_FIELD_SCAN.groupindex[key] + 1))
+        return found
+    
+    @staticmethod
+    def _determine_claim_type(text_lower: str) -> str:
         """
         Determine the claim type based on content
         
         Args:
-            text: Full document text
+            text_lower: Full document text, already lowercased by the caller
             
         Returns:
             Claim type string
         """
-        text_lower = text.lower()
-        
         # Check for injury-related keywords
-        injury_keywords = ['injury', 'injured', 'hospital', 'medical', 'ambulance', 'bodily']
-        if any(keyword in text_lower for keyword in injury_keywords):
+        if _has_injury_keyword(text_lower):
             return 'injury'
         
         # Check for property damage
-        if 'property' in text_lower or 'damage' in text_lower:
+        if _has_property_keyword(text_lower):
             return 'property_damage'
         
         # Check for collision
-        if 'collision' in text_lower or 'accident' in text_lower:
+        if _has_collision_keyword(text_lower):
             return 'collision'
         
         # Default to auto if it's an auto form
         return 'auto'
     
-    def flatten_extracted_data(self, extracted: Dict[str, Any]) -> Dict[str, Any]:
+    def get_structured(self, flattened_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Flatten nested extracted data for easier processing
+        Group flat extracted data by form section
         
         Args:
-            extracted: Nested extracted data
+            flattened_data: Flat extracted data
             
         Returns:
-            Flattened dictionary
+            Nested dictionary keyed by section
         """
-        flattened = {}
-        
-        # Policy Information
-        flattened['policy_number'] = extracted['policy_information'].get('policy_number')
-        flattened['policyholder_name'] = extracted['policy_information'].get('policyholder_name')
-        flattened['effective_date'] = extracted['policy_information'].get('effective_date')
-        
-        # Incident Information
-        flattened['date_of_loss'] = extracted['incident_information'].get('date_of_loss')
-        flattened['time_of_loss'] = extracted['incident_information'].get('time')
-        flattened['location_of_loss'] = extracted['incident_information'].get('location')
-        flattened['description_of_accident'] = extracted['incident_information'].get('description')
-        
-        # Involved Parties
-        flattened['claimant'] = extracted['involved_parties'].get('claimant')
-        flattened['driver_name'] = extracted['involved_parties'].get('driver_name')
-        flattened['contact_phone'] = extracted['involved_parties'].get('contact_phone')
-        flattened['contact_email'] = extracted['involved_parties'].get('contact_email')
-        
-        # Asset Details
-        flattened['asset_type'] = extracted['asset_details'].get('asset_type')
-        flattened['asset_id'] = extracted['asset_details'].get('asset_id')
-        flattened['vehicle_description'] = extracted['asset_details'].get('vehicle_description')
-        flattened['estimated_damage'] = extracted['asset_details'].get('estimated_damage')
-        
-        # Other
-        flattened['claim_type'] = extracted['other_fields'].get('claim_type')
-        flattened['line_of_business'] = extracted['other_fields'].get('line_of_business')
-        flattened['naic_code'] = extracted['other_fields'].get('naic_code')
-        
-        return flattened
+        return {
+            'policy_information': {
+                'policy_number': flattened_data.get('policy_number'),
+                'policyholder_name': flattened_data.get('policyholder_name'),
+                'effective_date': flattened_data.get('effective_date')
+            },
+            'incident_information': {
+                'date_of_loss': flattened_data.get('date_of_loss'),
+                'time': flattened_data.get('time_of_loss'),
+                'location': flattened_data.get('location_of_loss'),
+                'description': flattened_data.get('description_of_accident')
+            },
+            'involved_parties': {
+                'claimant': flattened_data.get('claimant'),
+                'driver_name': flattened_data.get('driver_name'),
+                'contact_phone': flattened_data.get('contact_phone'),
+                'contact_email': flattened_data.get('contact_email')
+            },
+            'asset_details': {
+                'asset_type': flattened_data.get('asset_type'),
+                'asset_id': flattened_data.get('asset_id'),
+                'vehicle_description': flattened_data.get('vehicle_description'),
+                'estimated_damage': flattened_data.get('estimated_damage')
+            },
+            'other_fields': {
+                'claim_type': flattened_data.get('claim_type'),
+                'line_of_business': flattened_data.get('line_of_business'),
+                'naic_code': flattened_data.get('naic_code')
+            }
+        }
     
     def validate_fields(self, flattened_data: Dict[str, Any]) -> List[str]:
         """
@@ -261,15 +589,10 @@ class ClaimsProcessor:
             flattened_data: Flattened extracted data
             
         Returns:
-            List of missing field names
+            List of missing field names, in ``MANDATORY_FIELDS`` order
         """
-        missing = []
-        
-        for field in self.MANDATORY_FIELDS:
-            if not flattened_data.get(field):
-                missing.append(field)
-        
-        return missing
+        get = flattened_data.get
+        return [field for field in self.MANDATORY_FIELDS if not get(field)]
     
     def route_claim(self, flattened_data: Dict[str, Any], missing_fields: List[str]) -> tuple:
         """
@@ -292,7 +615,7 @@ class ClaimsProcessor:
         
         # Rule 2: Fraud indicators → Investigation Flag
         description = flattened_data.get('description_of_accident', '').lower()
-        if any(keyword in description for keyword in self.FRAUD_KEYWORDS):
+        if _keyword_matcher(tuple(self.FRAUD_KEYWORDS))(description):
             route = "Investigation Queue"
             reasons.append("Description contains potential fraud indicators")
             return route, '; '.join(reasons)
@@ -318,22 +641,38 @@ class ClaimsProcessor:
         
         return route, '; '.join(reasons)
     
-    def process_claim(self, pdf_path: str) -> Dict[str, Any]:
+    def process_text(self, text: str) -> Dict[str, Any]:
         """
-        Main processing pipeline
+        Processing pipeline for FNOL documents that are already plain text
+        
+        Mandatory fields are extracted first. If any is missing the claim goes
+        to Manual Review regardless of the rest, so the supplementary fields
+        are not extracted at all.
         
         Args:
-            pdf_path: Path to FNOL PDF file
+            text: Full document text
             
         Returns:
             Complete processing result in JSON format
         """
-        # Extract data from PDF
-        extracted = self.extract_from_pdf(pdf_path)
+        flattened = dict.fromkeys(self.EXTRACTED_FIELDS)
+        flattened.update(self._extract_mandatory_fields(text))
+        
+        if not self.validate_fields(flattened):
+            flattened.update(self._extract_supplementary_fields(text))
         
-        # Flatten the data
-        flattened = self.flatten_extracted_data(extracted)
+        return self._build_result(flattened)
+    
+    def _build_result(self, flattened: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate and route extracted data
         
+        Args:
+            flattened: Flat extracted data
+            
+        Returns:
+            Complete processing result in JSON format
+        """
         # Validate fields
         missing = self.validate_fields(flattened)
         
@@ -341,12 +680,59 @@ class ClaimsProcessor:
         route, reasoning = self.route_claim(flattened, missing)
         
         # Prepare output
-        result = {
+        return {
             "extractedFields": flattened,
             "missingFields": missing,
             "recommendedRoute": route,
             "reasoning": reasoning
         }
+    
+    def process_claim(self, pdf_path: str) -> Dict[str, Any]:
+        """
+        Main processing pipeline
+        
+        Results are cached by processor class and the SHA-256 of the PDF
+        contents, so resubmitting an identical document skips extraction and
+        routing. Documents that could not be read are not cached. The cache is
+        shared by all threads.
+        
+        Args:
+            pdf_path: Path to FNOL PDF file
+            
+        Returns:
+            Complete processing result in JSON format
+        """
+        try:
+            key = (type(self), _file_digest(pdf_path))
+        except OSError:
+            # Unreadable file: let the pipeline report it, but don't cache
+            key = None
+        
+        if key is not None:
+            with _RESULT_CACHE_LOCK:
+                cached = _RESULT_CACHE.get(key)
+                if cached is not None:
+                    _RESULT_CACHE.move_to_end(key)
+            # Cached results are never mutated, so they can be copied unlocked
+            if cached is not None:
+                return deepcopy(cached)
+        
+        # Extract data from PDF
+        try:
+            full_text = self._read_pdf_text(pdf_path)
+        except Exception as e:
+            print(f"Error extracting PDF: {str(e)}")
+            # Not cached, so a retry reads the document again
+            return self._build_result(dict.fromkeys(self.EXTRACTED_FIELDS))
+        
+        result = self.process_text(full_text)
+        
+        if key is not None:
+            cached = deepcopy(result)
+            with _RESULT_CACHE_LOCK:
+                _RESULT_CACHE[key] = cached
+                if len(_RESULT_CACHE) > self.RESULT_CACHE_SIZE:
+                    _RESULT_CACHE.popitem(last=False)
         
         return result
 
@@ -355,13 +741,12 @@ def main():
     """
     Main entry point for the claims processor
     """
-    import sys
-    
     if len(sys.argv) < 2:
-        print("Usage: python claims_processor.py <path_to_fnol_pdf>")
+        print("Usage: python claims_processor.py <path_to_fnol_pdf> [--compact]")
         sys.exit(1)
     
     pdf_path = sys.argv[1]
+    compact = '--compact' in sys.argv[2:]
     
     print(f"\n{'='*60}")
     print("AUTONOMOUS INSURANCE CLAIMS PROCESSING AGENT")
@@ -372,13 +757,16 @@ def main():
     processor = ClaimsProcessor()
     result = processor.process_claim(pdf_path)
     
+    # Serialize once for both display and file
+    output = to_json_bytes(result, compact=compact)
+    
     # Display results
-    print(json.dumps(result, indent=2))
+    print(output.decode('utf-8'))
     
     # Save to file
     output_file = "claim_processing_result.json"
-    with open(output_file, 'w') as f:
-        json.dump(result, f, indent=2)
+    with open(output_file, 'wb') as f:
+        f.write(output)
     
     print(f"\n{'='*60}")
     print(f"Results saved to: {output_file}")
@@ -31,48 +31,22 @@ def print_field(label, value, indent=2):
         print(f"{spaces}{label}: [MISSING]")
 
 
-def demo_extraction(processor, sample_file):
+def demo_extraction(flattened):
     """Demonstrate field extraction"""
     print_section("📄 FIELD EXTRACTION")
     
-    # Process the file
-    with open(sample_file, 'r') as f:
-        text = f.read()
-    
-    # Extract policy info
-    policy_num = processor._extract_field(text, r'POLICY NUMBER[:\s]*([A-Z0-9-]+)')
-    print_field("Policy Number", policy_num)
-    
-    name = processor._extract_field(text, r'NAME OF INSURED[:\s]*\(First, Middle, Last\)[:\s]*([A-Za-z\s,\.]+?)(?:\n|INSURED)')
-    print_field("Policyholder", name)
-    
-    date = processor._extract_field(text, r'DATE OF LOSS AND TIME[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})')
-    print_field("Loss Date", date)
+    print_field("Policy Number", flattened.get('policy_number'))
+    print_field("Policyholder", flattened.get('policyholder_name'))
+    print_field("Loss Date", flattened.get('date_of_loss'))
     
-    estimate = processor._extract_field(text, r'ESTIMATE AMOUNT:[:\s]*\$?([0-9,]+(?:\.\d{2})?)')
-    print_field("Damage Estimate", f"${estimate}" if estimate else None)
-    
-    return text
+    estimate = flattened.get('estimated_damage')
+    print_field("Damage Estimate", f"${estimate:,.2f}" if estimate is not None else None)
 
 
-def demo_validation(text, processor):
+def demo_validation(flattened, processor):
     """Demonstrate field validation"""
     print_section("✅ FIELD VALIDATION")
     
-    # Extract and flatten data
-    extracted = processor.extract_from_pdf.__wrapped__(processor, None)  # Mock
-    # Simulate by processing text
-    extracted = {
-        'policy_information': {
-            'policy_number': processor._extract_field(text, r'POLICY NUMBER[:\s]*([A-Z0-9-]+)')
-        },
-        'incident_information': {},
-        'involved_parties': {},
-        'asset_details': {},
-        'other_fields': {}
-    }
-    
-    flattened = processor.flatten_extracted_data(extracted)
     missing = processor.validate_fields(flattened)
     
     print(f"  Total Fields Checked: {len(processor.MANDATORY_FIELDS)}")
@@ -84,43 +58,14 @@ def demo_validation(text, processor):
             print(f"    - {field}")
     else:
         print("\n  ✓ All mandatory fields present")
+    
+    return missing
 
 
-def demo_routing(sample_file, processor):
+def demo_routing(flattened, missing, processor):
     """Demonstrate routing decision"""
     print_section("🎯 ROUTING DECISION")
     
-    result = None
-    with open(sample_file, 'r') as f:
-        text = f.read()
-    
-    # Simulate full processing
-    extracted = {
-        'policy_information': {
-            'policy_number': processor._extract_field(text, r'POLICY NUMBER[:\s]*([A-Z0-9-]+)'),
-            'policyholder_name': processor._extract_field(text, r'NAME OF INSURED[:\s]*\(First, Middle, Last\)[:\s]*([A-Za-z\s,\.]+?)(?:\n|INSURED)')
-        },
-        'incident_information': {
-            'date_of_loss': processor._extract_field(text, r'DATE OF LOSS AND TIME[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})'),
-            'location': processor._extract_field(text, r'CITY, STATE, ZIP:[:\s]*([^\n]+)'),
-            'description': processor._extract_field(text, r'DESCRIPTION OF ACCIDENT[:\s]*([^\n]+(?:\n(?!INSURED VEHICLE|DRIVER)[^\n]+)*)')
-        },
-        'involved_parties': {},
-        'asset_details': {
-            'estimated_damage': None
-        },
-        'other_fields': {
-            'claim_type': processor._determine_claim_type(text)
-        }
-    }
-    
-    # Get damage estimate
-    estimate = processor._extract_field(text, r'ESTIMATE AMOUNT:[:\s]*\$?([0-9,]+(?:\.\d{2})?)')
-    if estimate:
-        extracted['asset_details']['estimated_damage'] = float(estimate.replace(',', ''))
-    
-    flattened = processor.flatten_extracted_data(extracted)
-    missing = processor.validate_fields(flattened)
     route, reasoning = processor.route_claim(flattened, missing)
     
     print(f"  Route: {route}")
@@ -146,14 +91,20 @@ def demo_complete_flow(sample_file):
     
     processor = ClaimsProcessor()
     
+    # Read and extract once; every step below works on the same data
+    with open(sample_file, 'r') as f:
+        text = f.read()
+    
+    flattened = processor._extract_fields_from_text(text)
+    
     # Step 1: Extraction
-    text = demo_extraction(processor, sample_file)
+    demo_extraction(flattened)
     
     # Step 2: Validation
-    demo_validation(text, processor)
+    missing = demo_validation(flattened, processor)
     
     # Step 3: Routing
-    demo_routing(sample_file, processor)
+    demo_routing(flattened, missing, processor)
     
     print("\n" + "="*80 + "\n")
 